@@ -0,0 +1,223 @@
+"""
+Shared data loading and metric computation for the dashboard scripts
+
+Both dashboard scripts chart the same funnel and A/B numbers. Loading and
+aggregation live here, memoized on the file path and modification time, so
+each data file is read and each metric is computed once per process however
+many figures use it, and a rewritten file is picked up again. The cached
+results are shared, so callers must not modify them.
+"""
+
+import functools
+import os
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pyarrow import csv as pacsv
+
+
+# Test data paths without extension; a .parquet file (written by
+# generate_data.py) is read when present, otherwise the .csv file
+USERS_FILE = 'test_data/users_20251223'
+EVENTS_FILE = 'test_data/events_20251223'
+
+# Low-cardinality string columns are dictionary-encoded while parsing, so
+# they arrive in pandas as categoricals
+CATEGORY = pa.dictionary(pa.int32(), pa.string())
+
+# Narrowest type of each column the dashboards use
+USERS_COLUMNS = {'user_segment': CATEGORY, 'verified_neighborhood': pa.bool_()}
+EVENTS_COLUMNS = {'event_type': CATEGORY, 'ab_group': CATEGORY}
+
+FUNNEL_ORDER = ['page_view', 'search', 'item_view', 'chat_click', 'chat_send']
+AB_GROUPS = ['control', 'treatment']
+
+
+def data_file(path_stem: str) -> str:
+    """
+    Pick the file backing a test data table
+    
+    The dashboards only read data; the Parquet copy is written by the
+    generator (python scripts/generate_data.py --output test_data --date ...).
+    
+    Args:
+        path_stem: File path without the .parquet/.csv extension
+    
+    Returns:
+        The .parquet path if that file exists, otherwise the .csv path
+    """
+    parquet_path = f'{path_stem}.parquet'
+    return parquet_path if os.path.exists(parquet_path) else f'{path_stem}.csv'
+
+
+def _file_cache(default_stem: str):
+    """
+    Memoize a function of a test data table on its path and the file's mtime
+    
+    Results are shared between callers, not copied, so callers must not
+    mutate the returned DataFrames or Series.
+    
+    Args:
+        default_stem: path_stem used when the caller passes none
+    """
+    def decorator(func):
+        @functools.lru_cache(maxsize=None)
+        def cached(path_stem, data_path, mtime):
+            return func(path_stem)
+        
+        @functools.wraps(func)
+        def wrapper(path_stem: str = default_stem):
+            data_path = data_file(path_stem)
+            return cached(path_stem, data_path, os.path.getmtime(data_path))
+        
+        return wrapper
+    
+    return decorator
+
+
+def read_table(path_stem: str, column_types: Dict[str, pa.DataType]) -> pd.DataFrame:
+    """
+    Read a test data table, preferring its Parquet copy over the CSV
+    
+    Args:
+        path_stem: File path without the .parquet/.csv extension
+        column_types: Arrow type of each column to read; only these columns
+            are read, and dictionary types load as categoricals
+    
+    Returns:
+        DataFrame with the table's data
+    """
+    path = data_file(path_stem)
+    
+    if path.endswith('.parquet'):
+        categorical = [col for col, col_type in column_types.items() if pa.types.is_dictionary(col_type)]
+        table = pq.read_table(path, columns=list(column_types), read_dictionary=categorical)
+        return table.cast(pa.schema(column_types)).to_pandas()
+    
+    # Arrow's multithreaded CSV reader; columns outside column_types are
+    # skipped rather than converted
+    convert_options = pacsv.ConvertOptions(column_types=column_types, include_columns=list(column_types))
+    return pacsv.read_csv(path, convert_options=convert_options).to_pandas()
+
+
+@_file_cache(USERS_FILE)
+def load_users(path_stem: str) -> pd.DataFrame:
+    """
+    Load the user columns the dashboards use
+    
+    Args:
+        path_stem: Users file path without extension
+    
+    Returns:
+        DataFrame with user_segment (categorical) and verified_neighborhood
+    """
+    return read_table(path_stem, USERS_COLUMNS)
+
+
+@_file_cache(EVENTS_FILE)
+def load_events(path_stem: str) -> pd.DataFrame:
+    """
+    Load the event columns the dashboards use
+    
+    Args:
+        path_stem: Events file path without extension
+    
+    Returns:
+        DataFrame with event_type and ab_group as categoricals
+    """
+    return read_table(path_stem, EVENTS_COLUMNS)
+
+
+def category_counts(values: pd.Series) -> pd.Series:
+    """
+    Count each category of a categorical Series
+    
+    Counts the integer category codes with np.bincount rather than hashing
+    values like value_counts does.
+    
+    Args:
+        values: Categorical Series
+    
+    Returns:
+        Series of counts indexed by category
+    """
+    codes = values.cat.codes.to_numpy()
+    counts = np.bincount(codes[codes >= 0], minlength=len(values.cat.categories))
+    return pd.Series(counts, index=values.cat.categories)
+
+
+@_file_cache(USERS_FILE)
+def compute_user_counts(path_stem: str) -> Tuple[pd.Series, Dict[bool, int]]:
+    """
+    Count users per segment and per verification status
+    
+    Args:
+        path_stem: Users file path without extension
+    
+    Returns:
+        Tuple of (counts per user_segment, dict of counts per
+        verified_neighborhood value)
+    """
+    users_df = load_users(path_stem)
+    values, counts = np.unique(users_df['verified_neighborhood'].to_numpy(), return_counts=True)
+    return category_counts(users_df['user_segment']), dict(zip(values.tolist(), counts.tolist()))
+
+
+@_file_cache(EVENTS_FILE)
+def compute_funnel(path_stem: str) -> np.ndarray:
+    """
+    Count events per funnel stage
+    
+    Args:
+        path_stem: Events file path without extension
+    
+    Returns:
+        Array of event counts in FUNNEL_ORDER
+    """
+    funnel_counts = category_counts(load_events(path_stem)['event_type'])
+    return funnel_counts.reindex(FUNNEL_ORDER, fill_value=0).to_numpy(dtype=np.int64)
+
+
+def stage_conversion_rates(funnel_data: np.ndarray) -> np.ndarray:
+    """
+    Compute stage-to-stage conversion rates in one vectorized divide
+    
+    Args:
+        funnel_data: Event counts per funnel stage
+    
+    Returns:
+        Array of len(funnel_data) - 1 rates in percent (0 after an empty stage)
+    """
+    fd = np.asarray(funnel_data, dtype=np.float64)
+    return fd[1:] / np.where(fd[:-1] > 0, fd[:-1], 1) * 100
+
+
+@_file_cache(EVENTS_FILE)
+def compute_ab(path_stem: str) -> Tuple[pd.DataFrame, pd.Series]:
+    """
+    Count events per A/B group and event type in a single pass
+    
+    Args:
+        path_stem: Events file path without extension
+    
+    Returns:
+        Tuple of (counts indexed by AB_GROUPS with FUNNEL_ORDER columns,
+        chat click rate per group in percent)
+    """
+    events_df = load_events(path_stem)
+    groups = events_df['ab_group'].cat.categories
+    types = events_df['event_type'].cat.categories
+    
+    # Count (group, type) code pairs straight from the categorical codes;
+    # no filtered DataFrames are built
+    grp = events_df['ab_group'].cat.codes.to_numpy()
+    etp = events_df['event_type'].cat.codes.to_numpy()
+    valid = (grp >= 0) & (etp >= 0)
+    counts = np.bincount(grp[valid] * len(types) + etp[valid], minlength=len(groups) * len(types))
+    ab_ct = pd.DataFrame(counts.reshape(len(groups), len(types)), index=groups, columns=types).reindex(
+        index=AB_GROUPS, columns=FUNNEL_ORDER, fill_value=0)
+    ab_rates = (ab_ct['chat_click'] / ab_ct['item_view'].where(ab_ct['item_view'] > 0) * 100).fillna(0)
+    return ab_ct, ab_rates
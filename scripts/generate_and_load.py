@@ -0,0 +1,74 @@
+"""
+Generate and Load Script for BigQuery
+
+This script generates synthetic data and loads it into BigQuery in one process,
+handing the generated DataFrames straight to the BigQuery client instead of
+writing data files and reading them back.
+"""
+
+import os
+import sys
+
+from generate_data import generate_data
+from load_data import get_bigquery_client, load_dataframes, verify_data
+
+
+def generate_and_load(client, num_users: int = 1000, dataset_id: str = "analytics",
+                      output_dir: str = None):
+    """
+    Generate synthetic data and load it into BigQuery
+    
+    Args:
+        client: BigQuery client
+        num_users: Number of users to generate
+        dataset_id: Dataset name
+        output_dir: Directory to also save data files to (None to skip)
+    """
+    users_df, events_df = generate_data(num_users=num_users, output_dir=output_dir)
+    load_dataframes(client, users_df, events_df, dataset_id)
+
+
+def main():
+    """Main generate-and-load function"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Generate synthetic data and load it to BigQuery')
+    parser.add_argument('--project-id', type=str, help='GCP Project ID',
+                       default=os.getenv('GCP_PROJECT_ID'))
+    parser.add_argument('--credentials', type=str, help='Path to service account key file',
+                       default=os.getenv('GOOGLE_APPLICATION_CREDENTIALS', 'service-account-key.json'))
+    parser.add_argument('--dataset', type=str, default='analytics', help='Dataset name')
+    parser.add_argument('--users', type=int, default=1000, help='Number of users to generate')
+    parser.add_argument('--output', type=str, default=None,
+                       help='Also save data files to this directory')
+    
+    args = parser.parse_args()
+    
+    if not args.project_id:
+        print("[ERROR] Project ID is required. Set GCP_PROJECT_ID environment variable or use --project-id")
+        sys.exit(1)
+    
+    print(f"[*] Generating and loading data to BigQuery project: {args.project_id}")
+    print(f"[*] Dataset: {args.dataset}")
+    
+    # Create client
+    try:
+        client = get_bigquery_client(args.project_id, args.credentials)
+        print(f"[OK] Connected to BigQuery")
+    except Exception as e:
+        print(f"[ERROR] Failed to connect to BigQuery: {e}")
+        sys.exit(1)
+    
+    try:
+        generate_and_load(client, args.users, args.dataset, args.output)
+        verify_data(client, args.dataset)
+        
+        print(f"\n[OK] Data generation and loading complete!")
+    
+    except Exception as e:
+        print(f"[ERROR] Failed to load data: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,25 +6,105 @@ import sys
 import os
 from datetime import datetime
 
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from src.generator.users import UserGenerator
 from src.generator.events import EventGenerator
+from src.generator.schema import EVENTS_SCHEMA, USERS_SCHEMA, to_arrow_schema
+
+
+def to_bigquery_table(df: pd.DataFrame, schema: pa.Schema) -> pa.Table:
+    """
+    Convert generated data into an Arrow table BigQuery can append as-is
+    
+    Args:
+        df: Generated users or events DataFrame
+        schema: Arrow schema of the destination table (see to_arrow_schema)
+        
+    Returns:
+        Arrow table with the schema's columns, non-null REQUIRED fields and
+        UTC timestamps
+    """
+    return pa.Table.from_pandas(df[schema.names], preserve_index=False).cast(schema)
+
+
+def write_events_parquet(event_gen: EventGenerator, users_df: pd.DataFrame, events_file: str,
+                         chunk_size: int = 65536, **kwargs):
+    """
+    Stream generated events into a Parquet file one user shard at a time
+    
+    Only one shard of events is held in memory at once, so memory use is
+    bounded by the shard size. Unless shard_size is given, shards are sized
+    to hold about chunk_size events each (see
+    EventGenerator.expected_events_per_user). The event type and A/B group
+    counts are tallied as the shards are written.
+    
+    Args:
+        event_gen: Event generator
+        users_df: DataFrame with user data
+        events_file: Output Parquet file path
+        chunk_size: Target number of events per shard, and the number of
+            rows per Parquet row group
+        **kwargs: Passed on to EventGenerator.iter_events_for_users
+        
+    Returns:
+        Tuple of (event type counts, A/B group counts)
+    """
+    event_counts = pd.Series(0, index=EventGenerator.EVENT_TYPES)
+    ab_counts = pd.Series(0, index=EventGenerator.AB_GROUPS)
+    schema = to_arrow_schema(EVENTS_SCHEMA)
+    
+    if 'shard_size' not in kwargs:
+        events_per_user = event_gen.expected_events_per_user(kwargs.get('events_per_user_range', (1, 5)))
+        kwargs['shard_size'] = max(1, int(chunk_size // events_per_user))
+    
+    with pq.ParquetWriter(events_file, schema, compression='snappy') as writer:
+        for shard_df in event_gen.iter_events_for_users(users_df, **kwargs):
+            writer.write_table(to_bigquery_table(shard_df, schema), row_group_size=chunk_size)
+            
+            event_counts += shard_df['event_type'].value_counts()
+            ab_counts += shard_df['ab_group'].value_counts()
+    
+    return event_counts, ab_counts
 
 
-def generate_data(num_users: int = 1000, output_dir: str = 'data'):
+def generate_data(num_users: int = 1000, output_dir: str = 'data', file_format: str = 'parquet',
+                  n_jobs: int = 1, stream: bool = False, chunk_size: int = 65536,
+                  excel_compat: bool = False, file_date: str = None):
     """
     Generate synthetic user and event data
     
     Args:
         num_users: Number of users to generate
-        output_dir: Directory to save output files
+        output_dir: Directory to save output files (None to skip writing files)
+        file_format: Output file format ('parquet' or 'csv')
+        n_jobs: Number of worker processes for event generation (-1 for all CPUs);
+            must be 1 when streaming, which generates shards in this process
+        stream: Write events to Parquet shard by shard instead of building
+            the full events DataFrame (events_df is then returned as None)
+        chunk_size: Target events per shard (and rows per Parquet row group)
+            when streaming; bounds the events held in memory
+        excel_compat: Write CSV files with a UTF-8 BOM so Excel detects the encoding
+        file_date: YYYYMMDD date used in the output file names (default: today)
+        
+    Returns:
+        Tuple of (users_df, events_df)
     """
+    if stream and (file_format != 'parquet' or output_dir is None):
+        raise ValueError("Streaming output requires the parquet format and an output directory")
+    if stream and n_jobs != 1:
+        raise ValueError("Streaming output generates events in a single process; use n_jobs=1")
+    
     print(f"[*] Starting data generation for {num_users} users...")
     
     # Create output directory if it doesn't exist
-    os.makedirs(output_dir, exist_ok=True)
+    if output_dir is not None:
+        os.makedirs(output_dir, exist_ok=True)
     
     # Generate users
     print("\n[*] Generating user profiles...")
@@ -36,22 +116,39 @@ def generate_data(num_users: int = 1000, output_dir: str = 'data'):
     print(f"   - Verified neighborhood: {users_df['verified_neighborhood'].sum()} ({users_df['verified_neighborhood'].mean()*100:.1f}%)")
     print(f"   - Segments: {dict(users_df['user_segment'].value_counts())}")
     
+    # Read the clock once so both files get the same date, even around midnight
+    if output_dir is not None:
+        file_date = file_date or datetime.now().strftime("%Y%m%d")
+        users_file = os.path.join(output_dir, f'users_{file_date}.{file_format}')
+        events_file = os.path.join(output_dir, f'events_{file_date}.{file_format}')
+    
     # Generate events
     print("\n[*] Generating user events...")
     event_gen = EventGenerator(seed=42)
-    events_df = event_gen.generate_events_for_users(
-        users_df,
-        events_per_user_range=(2, 10),
-        days_range=30
-    )
-    
-    print(f"[OK] Generated {len(events_df)} events")
-    print(f"   - Event types: {dict(events_df['event_type'].value_counts())}")
-    print(f"   - A/B groups: {dict(events_df['ab_group'].value_counts())}")
+    if stream:
+        events_df = None
+        event_counts, ab_counts = write_events_parquet(
+            event_gen, users_df, events_file,
+            chunk_size=chunk_size,
+            events_per_user_range=(2, 10),
+            days_range=30
+        )
+    else:
+        events_df = event_gen.generate_events_for_users(
+            users_df,
+            events_per_user_range=(2, 10),
+            days_range=30,
+            n_jobs=n_jobs
+        )
+        event_counts = events_df['event_type'].value_counts()
+        ab_counts = events_df['ab_group'].value_counts()
+    
+    print(f"[OK] Generated {int(event_counts.sum())} events")
+    print(f"   - Event types: {dict(event_counts)}")
+    print(f"   - A/B groups: {dict(ab_counts)}")
     
     # Calculate funnel conversion rates
     print("\n[*] Funnel Analysis:")
-    event_counts = events_df['event_type'].value_counts()
     
     page_views = event_counts.get('page_view', 0)
     searches = event_counts.get('search', 0)
@@ -68,12 +165,21 @@ def generate_data(num_users: int = 1000, output_dir: str = 'data'):
     if chat_clicks > 0:
         print(f"   Chat Click → Chat Send: {chat_sends/chat_clicks*100:.1f}%")
     
-    # Save to CSV
-    users_file = os.path.join(output_dir, f'users_{datetime.now().strftime("%Y%m%d")}.csv')
-    events_file = os.path.join(output_dir, f'events_{datetime.now().strftime("%Y%m%d")}.csv')
-    
-    users_df.to_csv(users_file, index=False, encoding='utf-8-sig')
-    events_df.to_csv(events_file, index=False, encoding='utf-8-sig')
+    if output_dir is None:
+        return users_df, events_df
+    
+    # Save to CSV, or to Parquet with the BigQuery table schemas so
+    # load_data.py can upload the files as-is
+    if file_format == 'csv':
+        encoding = 'utf-8-sig' if excel_compat else 'utf-8'
+        users_df.to_csv(users_file, index=False, encoding=encoding)
+        events_df.to_csv(events_file, index=False, encoding=encoding)
+    else:
+        pq.write_table(to_bigquery_table(users_df, to_arrow_schema(USERS_SCHEMA)), users_file,
+                       compression='snappy')
+        if events_df is not None:
+            pq.write_table(to_bigquery_table(events_df, to_arrow_schema(EVENTS_SCHEMA)), events_file,
+                           compression='snappy')
     
     print(f"\n[OK] Data saved:")
     print(f"   - Users: {users_file}")
@@ -88,7 +194,33 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Generate synthetic C2C marketplace data')
     parser.add_argument('--users', type=int, default=1000, help='Number of users to generate')
     parser.add_argument('--output', type=str, default='data', help='Output directory')
+    parser.add_argument('--format', type=str, default='parquet', choices=['parquet', 'csv'],
+                        help='Output file format')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='Worker processes for event generation (-1 for all CPUs); '
+                             'not supported with --stream')
+    parser.add_argument('--stream', action='store_true',
+                        help='Stream events to Parquet shard by shard to bound memory use')
+    parser.add_argument('--chunk-size', type=int, default=65536,
+                        help='Approximate events generated and held in memory per shard '
+                             '(and rows per Parquet row group) when streaming')
+    parser.add_argument('--excel-compat', action='store_true',
+                        help='Write CSV files with a UTF-8 BOM for opening in Excel')
+    parser.add_argument('--date', type=str, default=None,
+                        help='YYYYMMDD date for the output file names (default: today)')
     
     args = parser.parse_args()
     
-    users_df, events_df = generate_data(num_users=args.users, output_dir=args.output)
+    # Reject the combinations generate_data does not support before any work is done
+    if args.stream:
+        if args.format != 'parquet':
+            parser.error('--stream requires --format parquet')
+        if not args.output:
+            parser.error('--stream requires an --output directory')
+        if args.jobs != 1:
+            parser.error('--jobs is not supported with --stream')
+    
+    users_df, events_df = generate_data(num_users=args.users, output_dir=args.output,
+                                        file_format=args.format, n_jobs=args.jobs,
+                                        stream=args.stream, chunk_size=args.chunk_size,
+                                        excel_compat=args.excel_compat, file_date=args.date)
@@ -1,16 +1,19 @@
 """
 Data Loading Script for BigQuery
 
-This script loads generated CSV data into BigQuery tables.
+This script loads generated Parquet (or CSV) data into BigQuery tables.
 """
 
 import os
 import sys
+from typing import List
 import pandas as pd
 from google.cloud import bigquery
 from google.oauth2 import service_account
 from datetime import datetime
 
+from setup_bigquery import EVENTS_SCHEMA, USERS_SCHEMA
+
 
 def get_bigquery_client(project_id: str = None, credentials_path: str = None):
     """Create and return a BigQuery client"""
@@ -26,97 +29,168 @@ def get_bigquery_client(project_id: str = None, credentials_path: str = None):
     return client
 
 
-def load_users_data(client: bigquery.Client, csv_path: str, dataset_id: str = "analytics"):
+def read_data_file(path: str) -> pd.DataFrame:
     """
-    Load users data from CSV to BigQuery
+    Read a generated CSV file into a DataFrame
+    
+    CSV keeps no column types, so the date/timestamp and integer columns are
+    parsed after reading. Parquet files are uploaded directly instead (see
+    load_parquet_file).
     
     Args:
-        client: BigQuery client
-        csv_path: Path to users CSV file
-        dataset_id: Dataset name
+        path: Path to a .csv file
+        
+    Returns:
+        DataFrame with the file contents
     """
-    table_id = f"{client.project}.{dataset_id}.users"
+    df = pd.read_csv(path)
+    if 'join_date' in df.columns:
+        df['join_date'] = pd.to_datetime(df['join_date']).dt.date
+    if 'created_at' in df.columns:
+        df['created_at'] = pd.to_datetime(df['created_at'])
+    if 'event_timestamp' in df.columns:
+        df['event_timestamp'] = pd.to_datetime(df['event_timestamp'])
+    if 'message_length' in df.columns:
+        df['message_length'] = df['message_length'].astype('Int64')
+    return df
+
+
+def load_parquet_file(client: bigquery.Client, parquet_path: str, table_id: str,
+                      schema: List[bigquery.SchemaField]):
+    """
+    Upload a Parquet file as-is into a BigQuery table
     
-    print(f"[*] Loading users data from {csv_path}...")
+    generate_data writes its Parquet files with the table's Arrow schema
+    (non-null REQUIRED columns, UTC timestamps), so the file is streamed
+    from disk without reading it into memory or re-serializing it.
+    
+    Args:
+        client: BigQuery client
+        parquet_path: Path to Parquet file
+        table_id: Fully qualified destination table ID
+        schema: BigQuery schema of the destination table
+        
+    Returns:
+        Completed load job
+    """
+    job_config = bigquery.LoadJobConfig(
+        schema=schema,
+        source_format=bigquery.SourceFormat.PARQUET,
+        write_disposition=bigquery.WriteDisposition.WRITE_APPEND,
+    )
     
-    # Read CSV
-    df = pd.read_csv(csv_path)
+    with open(parquet_path, 'rb') as fh:
+        job = client.load_table_from_file(fh, table_id, job_config=job_config)
+    job.result()  # Wait for job to complete
     
-    # Convert date columns
-    df['join_date'] = pd.to_datetime(df['join_date']).dt.date
-    df['created_at'] = pd.to_datetime(df['created_at'])
+    return job
+
+
+def load_from_dataframe(client: bigquery.Client, df: pd.DataFrame, table_id: str,
+                        schema: List[bigquery.SchemaField]):
+    """
+    Load an in-memory DataFrame into a BigQuery table
     
-    print(f"[*] Loaded {len(df)} users from CSV")
+    Lets DataFrames produced in the same process (e.g. by generate_data) be
+    uploaded without writing and re-reading a data file. The client sends
+    the DataFrame as Parquet converted to the given schema.
     
-    # Configure load job
+    Args:
+        client: BigQuery client
+        df: DataFrame to load
+        table_id: Fully qualified destination table ID
+        schema: BigQuery schema of the destination table
+        
+    Returns:
+        Completed load job
+    """
     job_config = bigquery.LoadJobConfig(
+        schema=schema,
+        source_format=bigquery.SourceFormat.PARQUET,
         write_disposition=bigquery.WriteDisposition.WRITE_APPEND,
-        schema=[
-            bigquery.SchemaField("user_id", "STRING", mode="REQUIRED"),
-            bigquery.SchemaField("name", "STRING", mode="REQUIRED"),
-            bigquery.SchemaField("location", "STRING", mode="NULLABLE"),
-            bigquery.SchemaField("join_date", "DATE", mode="REQUIRED"),
-            bigquery.SchemaField("verified_neighborhood", "BOOLEAN", mode="REQUIRED"),
-            bigquery.SchemaField("created_at", "TIMESTAMP", mode="REQUIRED"),
-            bigquery.SchemaField("age_group", "STRING", mode="NULLABLE"),
-            bigquery.SchemaField("device_type", "STRING", mode="NULLABLE"),
-            bigquery.SchemaField("user_segment", "STRING", mode="NULLABLE"),
-        ]
     )
     
-    # Load data
     job = client.load_table_from_dataframe(df, table_id, job_config=job_config)
     job.result()  # Wait for job to complete
     
+    return job
+
+
+def load_users_data(client: bigquery.Client, data_path: str, dataset_id: str = "analytics"):
+    """
+    Load users data from a Parquet/CSV file to BigQuery
+    
+    Args:
+        client: BigQuery client
+        data_path: Path to users Parquet or CSV file
+        dataset_id: Dataset name
+    """
+    table_id = f"{client.project}.{dataset_id}.users"
+    
+    print(f"[*] Loading users data from {data_path}...")
+    
+    if not data_path.endswith('.csv'):
+        job = load_parquet_file(client, data_path, table_id, USERS_SCHEMA)
+        print(f"[OK] Loaded {job.output_rows} users to {table_id}")
+        return
+    
+    df = read_data_file(data_path)
+    
+    print(f"[*] Loaded {len(df)} users from {data_path}")
+    
+    load_from_dataframe(client, df, table_id, USERS_SCHEMA)
+    
     print(f"[OK] Loaded {len(df)} users to {table_id}")
 
 
-def load_events_data(client: bigquery.Client, csv_path: str, dataset_id: str = "analytics"):
+def load_events_data(client: bigquery.Client, data_path: str, dataset_id: str = "analytics"):
     """
-    Load events data from CSV to BigQuery
+    Load events data from a Parquet/CSV file to BigQuery
     
     Args:
         client: BigQuery client
-        csv_path: Path to events CSV file
+        data_path: Path to events Parquet or CSV file
         dataset_id: Dataset name
     """
     table_id = f"{client.project}.{dataset_id}.events"
     
-    print(f"[*] Loading events data from {csv_path}...")
+    print(f"[*] Loading events data from {data_path}...")
     
-    # Read CSV
-    df = pd.read_csv(csv_path)
+    if not data_path.endswith('.csv'):
+        job = load_parquet_file(client, data_path, table_id, EVENTS_SCHEMA)
+        print(f"[OK] Loaded {job.output_rows} events to {table_id}")
+        return
     
-    # Convert timestamp column
-    df['event_timestamp'] = pd.to_datetime(df['event_timestamp'])
+    df = read_data_file(data_path)
     
-    # Convert integer columns (handle NaN)
-    if 'message_length' in df.columns:
-        df['message_length'] = df['message_length'].fillna(0).astype('Int64')
+    print(f"[*] Loaded {len(df)} events from {data_path}")
     
-    print(f"[*] Loaded {len(df)} events from CSV")
+    load_from_dataframe(client, df, table_id, EVENTS_SCHEMA)
     
-    # Configure load job
-    job_config = bigquery.LoadJobConfig(
-        write_disposition=bigquery.WriteDisposition.WRITE_APPEND,
-        schema=[
-            bigquery.SchemaField("event_id", "STRING", mode="REQUIRED"),
-            bigquery.SchemaField("user_id", "STRING", mode="REQUIRED"),
-            bigquery.SchemaField("session_id", "STRING", mode="REQUIRED"),
-            bigquery.SchemaField("event_type", "STRING", mode="REQUIRED"),
-            bigquery.SchemaField("event_timestamp", "TIMESTAMP", mode="REQUIRED"),
-            bigquery.SchemaField("ab_group", "STRING", mode="REQUIRED"),
-            bigquery.SchemaField("item_id", "STRING", mode="NULLABLE"),
-            bigquery.SchemaField("search_query", "STRING", mode="NULLABLE"),
-            bigquery.SchemaField("message_length", "INTEGER", mode="NULLABLE"),
-        ]
-    )
+    print(f"[OK] Loaded {len(df)} events to {table_id}")
+
+
+def load_dataframes(client: bigquery.Client, users_df: pd.DataFrame, events_df: pd.DataFrame,
+                    dataset_id: str = "analytics"):
+    """
+    Load in-memory users and events DataFrames to BigQuery
     
-    # Load data
-    job = client.load_table_from_dataframe(df, table_id, job_config=job_config)
-    job.result()  # Wait for job to complete
+    Args:
+        client: BigQuery client
+        users_df: DataFrame with user data
+        events_df: DataFrame with event logs
+        dataset_id: Dataset name
+    """
+    users_table = f"{client.project}.{dataset_id}.users"
+    events_table = f"{client.project}.{dataset_id}.events"
     
-    print(f"[OK] Loaded {len(df)} events to {table_id}")
+    print(f"\n[*] Loading {len(users_df)} users to {users_table}...")
+    load_from_dataframe(client, users_df, users_table, USERS_SCHEMA)
+    print(f"[OK] Loaded {len(users_df)} users to {users_table}")
+    
+    print(f"[*] Loading {len(events_df)} events to {events_table}...")
+    load_from_dataframe(client, events_df, events_table, EVENTS_SCHEMA)
+    print(f"[OK] Loaded {len(events_df)} events to {events_table}")
 
 
 def verify_data(client: bigquery.Client, dataset_id: str = "analytics"):
@@ -170,8 +244,10 @@ def main():
     parser.add_argument('--credentials', type=str, help='Path to service account key file',
                        default=os.getenv('GOOGLE_APPLICATION_CREDENTIALS', 'service-account-key.json'))
     parser.add_argument('--dataset', type=str, default='analytics', help='Dataset name')
-    parser.add_argument('--data-dir', type=str, default='data', help='Directory containing CSV files')
-    parser.add_argument('--test', action='store_true', help='Generate test data if CSV files not found')
+    parser.add_argument('--data-dir', type=str, default='data', help='Directory containing data files')
+    parser.add_argument('--format', type=str, default='parquet', choices=['parquet', 'csv'],
+                       help='Format of the data files')
+    parser.add_argument('--test', action='store_true', help='Generate test data if data files not found')
     
     args = parser.parse_args()
     
@@ -190,26 +266,31 @@ def main():
         print(f"[ERROR] Failed to connect to BigQuery: {e}")
         sys.exit(1)
     
-    # Find CSV files
+    # Find data files
     today = datetime.now().strftime("%Y%m%d")
-    users_csv = os.path.join(args.data_dir, f'users_{today}.csv')
-    events_csv = os.path.join(args.data_dir, f'events_{today}.csv')
+    users_file = os.path.join(args.data_dir, f'users_{today}.{args.format}')
+    events_file = os.path.join(args.data_dir, f'events_{today}.{args.format}')
     
-    # Check if files exist, if not and --test flag, generate them
-    if not os.path.exists(users_csv) or not os.path.exists(events_csv):
+    # Check if files exist, if not and --test flag, generate them in-process
+    generated = None
+    if not os.path.exists(users_file) or not os.path.exists(events_file):
         if args.test:
-            print(f"[*] CSV files not found, generating test data...")
-            os.system(f"python scripts/generate_data.py --users 100 --output {args.data_dir}")
+            print(f"[*] Data files not found, generating test data...")
+            from generate_data import generate_data
+            generated = generate_data(num_users=100, output_dir=args.data_dir, file_format=args.format)
         else:
-            print(f"[ERROR] CSV files not found in {args.data_dir}")
-            print(f"Expected: {users_csv} and {events_csv}")
+            print(f"[ERROR] Data files not found in {args.data_dir}")
+            print(f"Expected: {users_file} and {events_file}")
             print(f"Run 'python scripts/generate_data.py' first, or use --test flag")
             sys.exit(1)
     
     # Load data
     try:
-        load_users_data(client, users_csv, args.dataset)
-        load_events_data(client, events_csv, args.dataset)
+        if generated is not None:
+            load_dataframes(client, *generated, args.dataset)
+        else:
+            load_users_data(client, users_file, args.dataset)
+            load_events_data(client, events_file, args.dataset)
         verify_data(client, args.dataset)
         
         print(f"\n[OK] Data loading complete!")
@@ -2,14 +2,17 @@
 Process test data and generate JSON for dashboard
 """
 
-import pandas as pd
+import numpy as np
 import json
 from datetime import datetime
 
+from _dash_data import EVENTS_COLUMNS, EVENTS_FILE, USERS_COLUMNS, USERS_FILE, read_table, stage_conversion_rates
+
+
 # Load data
 print("[*] Loading test data...")
-users_df = pd.read_csv('test_data/users_20251223.csv')
-events_df = pd.read_csv('test_data/events_20251223.csv')
+users_df = read_table(USERS_FILE, USERS_COLUMNS)
+events_df = read_table(EVENTS_FILE, EVENTS_COLUMNS)
 
 print(f"[OK] Loaded {len(users_df)} users and {len(events_df)} events")
 
@@ -20,33 +23,33 @@ events_per_user = total_events / total_users
 
 # Funnel metrics
 funnel_order = ['page_view', 'search', 'item_view', 'chat_click', 'chat_send']
-funnel_counts = events_df['event_type'].value_counts()
-funnel_data = {event: funnel_counts.get(event, 0) for event in funnel_order}
-
-# Calculate conversion rates
-conversions = []
-for i in range(len(funnel_order) - 1):
-    if funnel_data[funnel_order[i]] > 0:
-        rate = (funnel_data[funnel_order[i + 1]] / funnel_data[funnel_order[i]]) * 100
-        conversions.append({
-            'from': funnel_order[i],
-            'to': funnel_order[i + 1],
-            'rate': round(rate, 1),
-            'dropoff': round(100 - rate, 1)
-        })
+
+# Count every (event type, A/B group) pair in one pass; the funnel totals and
+# the A/B results are both read from this table
+event_counts = events_df.groupby(['event_type', 'ab_group'], observed=True).size().unstack(fill_value=0)
+funnel_counts = event_counts.sum(axis=1)
+stage_counts = funnel_counts.reindex(funnel_order, fill_value=0).to_numpy(dtype=np.int64)
+funnel_data = dict(zip(funnel_order, stage_counts.tolist()))
+
+# Calculate conversion rates for every stage pair at once
+rates = stage_conversion_rates(stage_counts)
+conversions = [
+    {'from': src, 'to': dst, 'rate': round(rate, 1), 'dropoff': round(100 - rate, 1)}
+    for src, dst, rate, reached in zip(funnel_order[:-1], funnel_order[1:], rates.tolist(), stage_counts[:-1] > 0)
+    if reached
+]
 
 # User segments
 segment_counts = users_df['user_segment'].value_counts().to_dict()
 verified_counts = users_df['verified_neighborhood'].value_counts().to_dict()
 
 # A/B test data
-ab_events = events_df[events_df['ab_group'].isin(['control', 'treatment'])]
+ab_counts = event_counts.T.reindex(index=['control', 'treatment'], columns=funnel_order, fill_value=0)
 ab_results = []
 
 for group in ['control', 'treatment']:
-    group_data = ab_events[ab_events['ab_group'] == group]
-    item_views = len(group_data[group_data['event_type'] == 'item_view'])
-    chat_clicks = len(group_data[group_data['event_type'] == 'chat_click'])
+    item_views = int(ab_counts.at[group, 'item_view'])
+    chat_clicks = int(ab_counts.at[group, 'chat_click'])
     rate = (chat_clicks / item_views * 100) if item_views > 0 else 0
     ab_results.append({
         'group': group,
@@ -62,6 +65,19 @@ if len(ab_results) == 2:
 else:
     lift = 0
 
+# Scalars used in several places of the dashboard data, computed once
+verified_users = verified_counts.get(True, 0)
+verified_percentage = round(verified_users / total_users * 100, 1)
+
+# Funnel stages: each stage's share of the previous stage, from the rates above
+stage_names = ['Page View', 'Search', 'Item View', 'Chat Click', 'Chat Send']
+stage_percentages = np.concatenate([[100.0], rates])
+stages = [
+    {'name': name, 'count': count, 'percentage': round(pct, 1), 'dropoff': round(100 - pct, 1)}
+    for name, count, pct in zip(stage_names, stage_counts.tolist(), stage_percentages.tolist())
+]
+stages[funnel_order.index('chat_click')]['is_bottleneck'] = True
+
 # Create dashboard data
 dashboard_data = {
     'metadata': {
@@ -74,43 +90,11 @@ dashboard_data = {
         'total_users': total_users,
         'total_events': total_events,
         'events_per_user': round(events_per_user, 1),
-        'verified_users': verified_counts.get(True, 0),
-        'verified_percentage': round(verified_counts.get(True, 0) / total_users * 100, 1)
+        'verified_users': verified_users,
+        'verified_percentage': verified_percentage
     },
     'funnel': {
-        'stages': [
-            {
-                'name': 'Page View',
-                'count': funnel_data['page_view'],
-                'percentage': 100.0,
-                'dropoff': 0.0
-            },
-            {
-                'name': 'Search',
-                'count': funnel_data['search'],
-                'percentage': round(funnel_data['search'] / funnel_data['page_view'] * 100, 1),
-                'dropoff': round((1 - funnel_data['search'] / funnel_data['page_view']) * 100, 1)
-            },
-            {
-                'name': 'Item View',
-                'count': funnel_data['item_view'],
-                'percentage': round(funnel_data['item_view'] / funnel_data['search'] * 100, 1),
-                'dropoff': round((1 - funnel_data['item_view'] / funnel_data['search']) * 100, 1)
-            },
-            {
-                'name': 'Chat Click',
-                'count': funnel_data['chat_click'],
-                'percentage': round(funnel_data['chat_click'] / funnel_data['item_view'] * 100, 1),
-                'dropoff': round((1 - funnel_data['chat_click'] / funnel_data['item_view']) * 100, 1),
-                'is_bottleneck': True
-            },
-            {
-                'name': 'Chat Send',
-                'count': funnel_data['chat_send'],
-                'percentage': round(funnel_data['chat_send'] / funnel_data['chat_click'] * 100, 1),
-                'dropoff': round((1 - funnel_data['chat_send'] / funnel_data['chat_click']) * 100, 1)
-            }
-        ]
+        'stages': stages
     },
     'segments': {
         'high_engagement': segment_counts.get('high_engagement', 0),
@@ -123,16 +107,17 @@ dashboard_data = {
         'lift': round(lift, 1)
     },
     'verification': {
-        'verified': verified_counts.get(True, 0),
+        'verified': verified_users,
         'not_verified': verified_counts.get(False, 0),
-        'percentage_verified': round(verified_counts.get(True, 0) / total_users * 100, 1)
+        'percentage_verified': verified_percentage
     }
 }
 
-# Save to JSON
+# Save to JSON; the file is only fetched by dashboards/index.html, so it is
+# written compact rather than indented
 output_file = 'dashboards/dashboard_data.json'
 with open(output_file, 'w') as f:
-    json.dump(dashboard_data, f, indent=2, default=int)
+    json.dump(dashboard_data, f, separators=(',', ':'), default=int)
 
 print(f"\n[OK] Dashboard data saved to: {output_file}")
 print(f"\n[*] Key Metrics:")
@@ -6,9 +6,27 @@ This script creates the BigQuery dataset and tables for the C2C marketplace anal
 
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from google.cloud import bigquery
 from google.oauth2 import service_account
 
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.generator import schema
+
+
+# Table schemas, built once at import
+USERS_SCHEMA = [
+    bigquery.SchemaField(name, field_type, mode=mode, description=description)
+    for name, field_type, mode, description in schema.USERS_SCHEMA
+]
+
+EVENTS_SCHEMA = [
+    bigquery.SchemaField(name, field_type, mode=mode, description=description)
+    for name, field_type, mode, description in schema.EVENTS_SCHEMA
+]
+
 
 def get_bigquery_client(project_id: str = None, credentials_path: str = None):
     """
@@ -66,19 +84,7 @@ def create_users_table(client: bigquery.Client, dataset_id: str = "analytics"):
     """
     table_id = f"{client.project}.{dataset_id}.users"
     
-    schema = [
-        bigquery.SchemaField("user_id", "STRING", mode="REQUIRED", description="Unique user identifier"),
-        bigquery.SchemaField("name", "STRING", mode="REQUIRED", description="User name"),
-        bigquery.SchemaField("location", "STRING", mode="NULLABLE", description="User location (city/district)"),
-        bigquery.SchemaField("join_date", "DATE", mode="REQUIRED", description="User registration date"),
-        bigquery.SchemaField("verified_neighborhood", "BOOLEAN", mode="REQUIRED", description="Whether user verified their neighborhood"),
-        bigquery.SchemaField("created_at", "TIMESTAMP", mode="REQUIRED", description="Record creation timestamp"),
-        bigquery.SchemaField("age_group", "STRING", mode="NULLABLE", description="User age group"),
-        bigquery.SchemaField("device_type", "STRING", mode="NULLABLE", description="User device type (iOS/Android)"),
-        bigquery.SchemaField("user_segment", "STRING", mode="NULLABLE", description="User engagement segment"),
-    ]
-    
-    table = bigquery.Table(table_id, schema=schema)
+    table = bigquery.Table(table_id, schema=USERS_SCHEMA)
     
     # Partition by join_date (DATE)
     table.time_partitioning = bigquery.TimePartitioning(
@@ -94,9 +100,10 @@ def create_users_table(client: bigquery.Client, dataset_id: str = "analytics"):
         print(f"[OK] Table {table_id} already exists")
     except Exception:
         table = client.create_table(table)
-        print(f"[OK] Created table {table_id}")
-        print(f"    - Partitioned by: join_date (DATE)")
-        print(f"    - Clustered by: user_segment, verified_neighborhood")
+        # One print call, so the lines stay together when tables are created concurrently
+        print(f"[OK] Created table {table_id}\n"
+              f"    - Partitioned by: join_date (DATE)\n"
+              f"    - Clustered by: user_segment, verified_neighborhood")
 
 
 def create_events_table(client: bigquery.Client, dataset_id: str = "analytics"):
@@ -109,19 +116,7 @@ def create_events_table(client: bigquery.Client, dataset_id: str = "analytics"):
     """
     table_id = f"{client.project}.{dataset_id}.events"
     
-    schema = [
-        bigquery.SchemaField("event_id", "STRING", mode="REQUIRED", description="Unique event identifier"),
-        bigquery.SchemaField("user_id", "STRING", mode="REQUIRED", description="User identifier"),
-        bigquery.SchemaField("session_id", "STRING", mode="REQUIRED", description="Session identifier"),
-        bigquery.SchemaField("event_type", "STRING", mode="REQUIRED", description="Type of event (page_view, search, item_view, chat_click, chat_send)"),
-        bigquery.SchemaField("event_timestamp", "TIMESTAMP", mode="REQUIRED", description="Event timestamp"),
-        bigquery.SchemaField("ab_group", "STRING", mode="REQUIRED", description="A/B test group (control, treatment, none)"),
-        bigquery.SchemaField("item_id", "STRING", mode="NULLABLE", description="Item identifier (for item-related events)"),
-        bigquery.SchemaField("search_query", "STRING", mode="NULLABLE", description="Search query text"),
-        bigquery.SchemaField("message_length", "INTEGER", mode="NULLABLE", description="Chat message length"),
-    ]
-    
-    table = bigquery.Table(table_id, schema=schema)
+    table = bigquery.Table(table_id, schema=EVENTS_SCHEMA)
     
     # Partition by event_timestamp (TIMESTAMP)
     table.time_partitioning = bigquery.TimePartitioning(
@@ -137,9 +132,9 @@ def create_events_table(client: bigquery.Client, dataset_id: str = "analytics"):
         print(f"[OK] Table {table_id} already exists")
     except Exception:
         table = client.create_table(table)
-        print(f"[OK] Created table {table_id}")
-        print(f"    - Partitioned by: event_timestamp (TIMESTAMP)")
-        print(f"    - Clustered by: event_type, ab_group")
+        print(f"[OK] Created table {table_id}\n"
+              f"    - Partitioned by: event_timestamp (TIMESTAMP)\n"
+              f"    - Clustered by: event_type, ab_group")
 
 
 def main():
@@ -174,12 +169,13 @@ def main():
     print(f"\n[*] Creating dataset...")
     create_dataset(client, args.dataset)
     
-    # Create tables
-    print(f"\n[*] Creating users table...")
-    create_users_table(client, args.dataset)
-    
-    print(f"\n[*] Creating events table...")
-    create_events_table(client, args.dataset)
+    # Create tables; they are independent, so their API round trips overlap
+    print(f"\n[*] Creating users and events tables...")
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [executor.submit(create_table, client, args.dataset)
+                   for create_table in (create_users_table, create_events_table)]
+        for future in futures:
+            future.result()
     
     print(f"\n[OK] BigQuery setup complete!")
     print(f"\nYou can now:")
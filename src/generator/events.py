@@ -7,9 +7,37 @@ including funnel events and A/B test group assignments.
 
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
-from typing import List, Dict, Tuple
-import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import repeat
+from typing import Dict, Iterator, List, Tuple
+
+from .ids import random_ids
+
+
+# Probability distribution for hours of the day, normalized once at import.
+# Higher activity in evening hours (18-23)
+_HOURLY_P = np.array([
+    0.01, 0.01, 0.01, 0.01, 0.01, 0.01,  # 0-5: very low
+    0.02, 0.03, 0.04, 0.04, 0.04, 0.05,  # 6-11: morning
+    0.05, 0.04, 0.04, 0.04, 0.05, 0.06,  # 12-17: afternoon
+    0.08, 0.09, 0.10, 0.09, 0.07, 0.03   # 18-23: evening peak
+], dtype=np.float64)
+_HOURLY_P /= _HOURLY_P.sum()
+
+# Realistic search queries, kept as an array so they can be picked by index
+_QUERIES = np.array([
+    '아이폰', '노트북', '자전거', '책상', '의자', '냉장고', '세탁기',
+    '에어컨', '선풍기', '전자레인지', '청소기', '운동화', '패딩',
+    '가방', '시계', '카메라', '게임기', '모니터', '키보드', '마우스'
+], dtype=object)
+
+# Funnel conversion multiplier per user engagement segment
+_SEG_MULT = {
+    'high_engagement': 1.3,
+    'medium_engagement': 1.0,
+    'low_engagement': 0.7
+}
 
 
 class EventGenerator:
@@ -32,6 +60,9 @@ class EventGenerator:
         'chat_click_to_chat_send': 0.80   # 80% who click actually send
     }
     
+    # A/B test groups ('none' = not in experiment)
+    AB_GROUPS = ['control', 'treatment', 'none']
+    
     def __init__(self, seed: int = 42):
         """
         Initialize the event generator
@@ -39,7 +70,7 @@ class EventGenerator:
         Args:
             seed: Random seed for reproducibility
         """
-        np.random.seed(seed)
+        self._seed_seq = np.random.SeedSequence(seed)
         self.seed = seed
     
     def assign_ab_group(self, user_id: str) -> str:
@@ -50,186 +81,269 @@ class EventGenerator:
             user_id: User identifier
             
         Returns:
-            'control' or 'treatment'
+            'control', 'treatment' or 'none'
         """
-        # Use hash of user_id for consistent assignment
-        hash_val = hash(user_id)
-        
-        # 40% in experiment (20% control, 20% treatment), 60% not in experiment
-        mod_val = hash_val % 100
-        
-        if mod_val < 20:
-            return 'control'
-        elif mod_val < 40:
-            return 'treatment'
-        else:
-            return 'none'  # Not in experiment
+        return self.assign_ab_groups([user_id])[0]
     
-    def generate_user_session(self, user_id: str, user_segment: str,
-                              session_start: datetime, ab_group: str) -> List[Dict]:
+    def assign_ab_groups(self, user_ids) -> np.ndarray:
         """
-        Generate events for a single user session
+        Assign users to A/B test groups (deterministic based on user_id)
+        
+        Uses pandas' stable 64-bit hash rather than the builtin hash(), which
+        is salted per interpreter run and would reshuffle groups between runs.
         
         Args:
-            user_id: User identifier
-            user_segment: User engagement segment
-            session_start: Session start timestamp
-            ab_group: A/B test group assignment
+            user_ids: Sequence of user identifiers
             
         Returns:
-            List of event dictionaries
+            Array of 'control', 'treatment' or 'none', aligned with user_ids
         """
-        events = []
-        session_id = str(uuid.uuid4())
-        current_time = session_start
-        
-        # Adjust conversion rates based on user segment
-        segment_multiplier = {
-            'high_engagement': 1.3,
-            'medium_engagement': 1.0,
-            'low_engagement': 0.7
-        }
-        multiplier = segment_multiplier.get(user_segment, 1.0)
+        hash_vals = pd.util.hash_pandas_object(pd.Series(user_ids, dtype=object), index=False).to_numpy()
         
-        # Treatment group gets boost in chat_click conversion
-        treatment_boost = 1.4 if ab_group == 'treatment' else 1.0
-        
-        # Event 1: Page view (always happens)
-        events.append(self._create_event(
-            user_id, session_id, 'page_view', current_time, ab_group
-        ))
-        current_time += timedelta(seconds=np.random.randint(5, 30))
-        
-        # Event 2: Search (probabilistic)
-        if np.random.random() < self.FUNNEL_RATES['page_view_to_search'] * multiplier:
-            events.append(self._create_event(
-                user_id, session_id, 'search', current_time, ab_group,
-                extra_data={'search_query': self._generate_search_query()}
-            ))
-            current_time += timedelta(seconds=np.random.randint(3, 15))
-            
-            # Event 3: Item view (probabilistic)
-            if np.random.random() < self.FUNNEL_RATES['search_to_item_view'] * multiplier:
-                item_id = str(uuid.uuid4())
-                events.append(self._create_event(
-                    user_id, session_id, 'item_view', current_time, ab_group,
-                    extra_data={'item_id': item_id}
-                ))
-                current_time += timedelta(seconds=np.random.randint(10, 60))
-                
-                # Event 4: Chat click (KEY CONVERSION POINT - affected by A/B test)
-                chat_click_rate = self.FUNNEL_RATES['item_view_to_chat_click'] * multiplier * treatment_boost
-                if np.random.random() < chat_click_rate:
-                    events.append(self._create_event(
-                        user_id, session_id, 'chat_click', current_time, ab_group,
-                        extra_data={'item_id': item_id}
-                    ))
-                    current_time += timedelta(seconds=np.random.randint(2, 10))
-                    
-                    # Event 5: Chat send (probabilistic)
-                    if np.random.random() < self.FUNNEL_RATES['chat_click_to_chat_send'] * multiplier:
-                        events.append(self._create_event(
-                            user_id, session_id, 'chat_send', current_time, ab_group,
-                            extra_data={'item_id': item_id, 'message_length': np.random.randint(10, 200)}
-                        ))
+        # 40% in experiment (20% control, 20% treatment), 60% not in experiment
+        mod_vals = hash_vals % 100
         
-        return events
+        return np.select(
+            [mod_vals < 20, mod_vals < 40],
+            ['control', 'treatment'],
+            default='none'  # Not in experiment
+        ).astype(object)
     
-    def _create_event(self, user_id: str, session_id: str, event_type: str,
-                     timestamp: datetime, ab_group: str, extra_data: Dict = None) -> Dict:
-        """Create a single event dictionary"""
-        event = {
-            'event_id': str(uuid.uuid4()),
-            'user_id': user_id,
-            'session_id': session_id,
-            'event_type': event_type,
-            'event_timestamp': timestamp,
-            'ab_group': ab_group
-        }
+    def expected_events_per_user(self, events_per_user_range: Tuple[int, int] = (1, 5)) -> float:
+        """
+        Estimate the average number of events generated per user
         
-        if extra_data:
-            event.update(extra_data)
+        Uses the baseline funnel rates, ignoring segment and treatment
+        multipliers and users who joined too recently to have sessions.
         
-        return event
-    
-    def _generate_search_query(self) -> str:
-        """Generate realistic search queries"""
-        queries = [
-            '아이폰', '노트북', '자전거', '책상', '의자', '냉장고', '세탁기',
-            '에어컨', '선풍기', '전자레인지', '청소기', '운동화', '패딩',
-            '가방', '시계', '카메라', '게임기', '모니터', '키보드', '마우스'
-        ]
-        return np.random.choice(queries)
+        Args:
+            events_per_user_range: Min and max number of sessions per user
+            
+        Returns:
+            Expected events per user
+        """
+        low, high = events_per_user_range
+        mean_sessions = (low + high - 1) / 2
+        mean_depth = 1 + np.cumprod(list(self.FUNNEL_RATES.values())).sum()
+        return mean_sessions * mean_depth
     
     def generate_events_for_users(self, users_df: pd.DataFrame,
                                   events_per_user_range: Tuple[int, int] = (1, 5),
-                                  days_range: int = 30) -> pd.DataFrame:
+                                  days_range: int = 30,
+                                  sort_output: bool = False,
+                                  n_jobs: int = 1,
+                                  shard_size: int = 50_000) -> pd.DataFrame:
         """
         Generate events for all users
         
+        Every random draw (session counts, session start times, funnel
+        outcomes, search queries, ...) is sampled for all sessions at once as
+        NumPy arrays, so there is no Python-level loop over users or sessions.
+        Users are split into shards of shard_size, each with its own child
+        seed, so the output does not depend on n_jobs.
+        
         Args:
             users_df: DataFrame with user data
             events_per_user_range: Min and max number of sessions per user
             days_range: Number of days to generate events for
+            sort_output: Sort events by timestamp. Off by default since
+                BigQuery partitions the events table by event_timestamp anyway
+            n_jobs: Number of worker processes for the shards (-1 for all CPUs)
+            shard_size: Number of users per shard
             
         Returns:
             DataFrame with event logs
         """
-        all_events = []
+        shards, rngs, todays = zip(*self._shard_args(users_df, shard_size))
         
-        for _, user in users_df.iterrows():
-            user_id = user['user_id']
-            user_segment = user.get('user_segment', 'medium_engagement')
-            join_date = pd.to_datetime(user['join_date'])
-            
-            # Assign A/B test group
-            ab_group = self.assign_ab_group(user_id)
-            
-            # Generate random number of sessions for this user
-            num_sessions = np.random.randint(*events_per_user_range)
+        if n_jobs == 1 or len(shards) == 1:
+            results = [
+                self._generate_shard_events(shard, rng, today, events_per_user_range, days_range)
+                for shard, rng, today in zip(shards, rngs, todays)
+            ]
+        else:
+            with ProcessPoolExecutor(max_workers=None if n_jobs == -1 else n_jobs) as executor:
+                results = list(executor.map(
+                    self._generate_shard_events, shards, rngs, todays,
+                    repeat(events_per_user_range), repeat(days_range)
+                ))
+        
+        columns = {name: np.concatenate([shard[name] for shard in results]) for name in results[0]}
+        
+        return self._build_events_frame(columns, sort_output)
+    
+    def iter_events_for_users(self, users_df: pd.DataFrame,
+                              events_per_user_range: Tuple[int, int] = (1, 5),
+                              days_range: int = 30,
+                              shard_size: int = 50_000) -> Iterator[pd.DataFrame]:
+        """
+        Generate events shard by shard without holding all of them in memory
+        
+        Yields the same events as generate_events_for_users (with the same
+        seed and shard_size), one DataFrame per shard of users.
+        
+        Args:
+            users_df: DataFrame with user data
+            events_per_user_range: Min and max number of sessions per user
+            days_range: Number of days to generate events for
+            shard_size: Number of users per shard
             
-            for _ in range(num_sessions):
-                # Random session start time after join date
-                days_since_join = min(days_range, (datetime.now().date() - join_date.date()).days)
-                if days_since_join <= 0:
-                    continue
-                    
-                random_day = np.random.randint(0, days_since_join + 1)
-                session_date = join_date + timedelta(days=random_day)
-                
-                # Random hour of the day (weighted towards evening)
-                hour = np.random.choice(range(24), p=self._get_hourly_distribution())
-                session_start = session_date.replace(
-                    hour=hour,
-                    minute=np.random.randint(0, 60),
-                    second=np.random.randint(0, 60)
-                )
-                
-                # Generate events for this session
-                session_events = self.generate_user_session(
-                    user_id, user_segment, session_start, ab_group
-                )
-                all_events.extend(session_events)
+        Yields:
+            DataFrame with the event logs of one shard
+        """
+        for shard, rng, today in self._shard_args(users_df, shard_size):
+            columns = self._generate_shard_events(shard, rng, today, events_per_user_range, days_range)
+            yield self._build_events_frame(columns)
+    
+    def _shard_args(self, users_df: pd.DataFrame,
+                    shard_size: int) -> List[Tuple[pd.DataFrame, np.random.Generator, np.datetime64]]:
+        """
+        Split users into shards, each with its own child random generator
         
-        # Convert to DataFrame
-        events_df = pd.DataFrame(all_events)
+        Both generate_events_for_users and iter_events_for_users shard through
+        here, so they generate the same events for the same seed. Shard i
+        always gets the seed sequence spawn() would hand out first, derived
+        without advancing a spawn counter, so repeated calls on one instance
+        repeat the same draws. The current date is read once here and shared
+        by every shard, so a run crossing midnight (or spread over worker
+        processes) still anchors all shards to the same day.
         
+        Args:
+            users_df: DataFrame with user data
+            shard_size: Number of users per shard
+            
+        Returns:
+            List of (users shard, random generator, today) tuples, at least one
+        """
+        n_shards = max(1, -(-len(users_df) // shard_size))
+        today = np.datetime64(datetime.now().date(), 'D')
+        return [
+            (users_df.iloc[i * shard_size:(i + 1) * shard_size],
+             np.random.default_rng(np.random.SeedSequence(self._seed_seq.entropy, spawn_key=(i,))),
+             today)
+            for i in range(n_shards)
+        ]
+    
+    def _build_events_frame(self, columns: Dict[str, np.ndarray],
+                            sort_output: bool = False) -> pd.DataFrame:
+        """Convert raw event column arrays into the events DataFrame"""
         # Sort by timestamp
-        if len(events_df) > 0:
-            events_df = events_df.sort_values('event_timestamp').reset_index(drop=True)
+        if sort_output:
+            order = np.argsort(columns['event_timestamp'], kind='stable')
+            columns = {name: values[order] for name, values in columns.items()}
         
-        return events_df
+        event_stage = columns['event_type']
+        columns['event_type'] = pd.Categorical.from_codes(event_stage, categories=self.EVENT_TYPES)
+        columns['ab_group'] = pd.Categorical(columns['ab_group'], categories=self.AB_GROUPS)
+        # Nullable integer so the column maps to BigQuery INTEGER rather than FLOAT
+        columns['message_length'] = pd.arrays.IntegerArray(columns['message_length'], event_stage != 4)
+        
+        return pd.DataFrame(columns)
     
-    def _get_hourly_distribution(self) -> np.ndarray:
-        """Get probability distribution for hours of the day"""
-        # Higher activity in evening hours (18-23)
-        probs = np.array([
-            0.01, 0.01, 0.01, 0.01, 0.01, 0.01,  # 0-5: very low
-            0.02, 0.03, 0.04, 0.04, 0.04, 0.05,  # 6-11: morning
-            0.05, 0.04, 0.04, 0.04, 0.05, 0.06,  # 12-17: afternoon
-            0.08, 0.09, 0.10, 0.09, 0.07, 0.03   # 18-23: evening peak
+    def _generate_shard_events(self, users_df: pd.DataFrame, rng: np.random.Generator,
+                               today: np.datetime64, events_per_user_range: Tuple[int, int],
+                               days_range: int) -> Dict[str, np.ndarray]:
+        """
+        Generate the event columns for one shard of users
+        
+        Args:
+            users_df: DataFrame with user data for this shard
+            rng: Random generator for this shard
+            today: Current date, shared by all shards of a run
+            events_per_user_range: Min and max number of sessions per user
+            days_range: Number of days to generate events for
+            
+        Returns:
+            Dict of event column arrays, with event_type as int8 stage codes
+        """
+        n_users = len(users_df)
+        
+        user_ids = users_df['user_id'].to_numpy()
+        join_dates = pd.to_datetime(users_df['join_date']).to_numpy().astype('datetime64[D]')
+        # Reuse A/B groups already attached to the users, otherwise hash the whole column
+        if 'ab_group' in users_df.columns:
+            ab_groups = users_df['ab_group'].to_numpy(dtype=object)
+        else:
+            ab_groups = self.assign_ab_groups(user_ids)
+        
+        # Adjust conversion rates based on user segment
+        if 'user_segment' in users_df.columns:
+            user_mult = (pd.Series(_SEG_MULT).reindex(users_df['user_segment'])
+                         .fillna(1.0).to_numpy(dtype=np.float64))
+        else:
+            user_mult = np.ones(n_users)
+        
+        # Sessions can only start after the join date; users who joined today get none
+        max_days = np.minimum(days_range, (today - join_dates).astype(np.int64))
+        num_sessions = rng.integers(*events_per_user_range, size=n_users)
+        num_sessions[max_days <= 0] = 0
+        
+        # Expand per-user attributes to one entry per session
+        session_user = np.repeat(np.arange(n_users), num_sessions)
+        n_sessions = len(session_user)
+        mult = user_mult[session_user]
+        session_ab = ab_groups[session_user]
+        
+        # Random session start time after join date (hour weighted towards evening),
+        # built as a single seconds offset from midnight of the join date
+        random_day = rng.integers(0, max_days[session_user] + 1)
+        hour = rng.choice(24, size=n_sessions, p=_HOURLY_P)
+        second_of_hour = rng.integers(0, 3600, size=n_sessions)
+        start_offset = random_day * 86400 + hour * 3600 + second_of_hour
+        session_start = join_dates.astype('datetime64[s]')[session_user] + start_offset.astype('timedelta64[s]')
+        
+        # Funnel outcomes: each stage requires the previous one to have happened,
+        # so a session's funnel depth is the length of its leading run of passes.
+        # Treatment group gets boost in chat_click conversion (KEY CONVERSION POINT)
+        treatment_boost = np.where(session_ab == 'treatment', 1.4, 1.0)
+        stage_rates = np.stack([
+            self.FUNNEL_RATES['page_view_to_search'] * mult,
+            self.FUNNEL_RATES['search_to_item_view'] * mult,
+            self.FUNNEL_RATES['item_view_to_chat_click'] * mult * treatment_boost,
+            self.FUNNEL_RATES['chat_click_to_chat_send'] * mult,
         ])
-        return probs / probs.sum()  # Normalize
+        passed = rng.random((4, n_sessions)) < stage_rates
+        depth = 1 + np.logical_and.accumulate(passed, axis=0).sum(axis=0)
+        
+        # Time spent before each following stage (search, item_view, chat_click,
+        # chat_send), drawn for all sessions at once
+        gaps = rng.integers(low=[5, 3, 10, 2], high=[30, 15, 60, 10], size=(n_sessions, 4))
+        offsets = np.zeros((n_sessions, 5), dtype=np.int64)
+        np.cumsum(gaps, axis=1, out=offsets[:, 1:])
+        stage_ts = session_start[:, None] + offsets.astype('timedelta64[s]')
+        
+        session_ids = random_ids(n_sessions)
+        item_ids = np.full(n_sessions, None, dtype=object)
+        viewed = depth >= 3
+        item_ids[viewed] = random_ids(int(viewed.sum()))
+        
+        # One event per reached stage, laid out session by session: the stage
+        # of an event is its position within the session's block
+        n_events = int(depth.sum())
+        event_session = np.repeat(np.arange(n_sessions), depth)
+        session_offset = np.cumsum(depth) - depth
+        event_stage = (np.arange(n_events) - session_offset[event_session]).astype(np.int8)
+        event_timestamp = stage_ts[event_session, event_stage]
+        
+        # Stage-specific attributes
+        is_search = event_stage == 1
+        search_query = np.full(n_events, None, dtype=object)
+        search_query[is_search] = _QUERIES[rng.integers(0, len(_QUERIES), size=int(is_search.sum()))]
+        is_chat_send = event_stage == 4
+        message_length = np.zeros(n_events, dtype=np.int64)
+        message_length[is_chat_send] = rng.integers(10, 200, size=int(is_chat_send.sum()))
+        
+        return {
+            'event_id': random_ids(n_events),
+            'user_id': user_ids[session_user[event_session]],
+            'session_id': session_ids[event_session],
+            'event_type': event_stage,
+            'event_timestamp': event_timestamp,
+            'ab_group': session_ab[event_session],
+            'search_query': search_query,
+            'item_id': np.where(event_stage >= 2, item_ids[event_session], None),
+            'message_length': message_length,
+        }
 
 
 def main():
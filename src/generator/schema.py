@@ -0,0 +1,66 @@
+"""
+Table Schemas
+
+This module defines the columns of the users and events tables as plain
+(name, type, mode, description) tuples, using BigQuery type names, so the
+generator can write schema-typed Parquet without the Google Cloud libraries.
+"""
+
+from typing import List, Tuple
+
+import pyarrow as pa
+
+
+USERS_SCHEMA = [
+    ("user_id", "STRING", "REQUIRED", "Unique user identifier"),
+    ("name", "STRING", "REQUIRED", "User name"),
+    ("location", "STRING", "NULLABLE", "User location (city/district)"),
+    ("join_date", "DATE", "REQUIRED", "User registration date"),
+    ("verified_neighborhood", "BOOLEAN", "REQUIRED", "Whether user verified their neighborhood"),
+    ("created_at", "TIMESTAMP", "REQUIRED", "Record creation timestamp"),
+    ("age_group", "STRING", "NULLABLE", "User age group"),
+    ("device_type", "STRING", "NULLABLE", "User device type (iOS/Android)"),
+    ("user_segment", "STRING", "NULLABLE", "User engagement segment"),
+]
+
+EVENTS_SCHEMA = [
+    ("event_id", "STRING", "REQUIRED", "Unique event identifier"),
+    ("user_id", "STRING", "REQUIRED", "User identifier"),
+    ("session_id", "STRING", "REQUIRED", "Session identifier"),
+    ("event_type", "STRING", "REQUIRED", "Type of event (page_view, search, item_view, chat_click, chat_send)"),
+    ("event_timestamp", "TIMESTAMP", "REQUIRED", "Event timestamp"),
+    ("ab_group", "STRING", "REQUIRED", "A/B test group (control, treatment, none)"),
+    ("item_id", "STRING", "NULLABLE", "Item identifier (for item-related events)"),
+    ("search_query", "STRING", "NULLABLE", "Search query text"),
+    ("message_length", "INTEGER", "NULLABLE", "Chat message length"),
+]
+
+
+# Arrow type written to Parquet for each BigQuery column type
+ARROW_TYPES = {
+    'STRING': pa.string(),
+    'INTEGER': pa.int64(),
+    'BOOLEAN': pa.bool_(),
+    'DATE': pa.date32(),
+    'TIMESTAMP': pa.timestamp('us', tz='UTC'),
+}
+
+
+def to_arrow_schema(schema: List[Tuple[str, str, str, str]]) -> pa.Schema:
+    """
+    Build the Arrow schema matching a table schema
+    
+    REQUIRED columns become non-null fields and timestamps are UTC, so a
+    Parquet file written with it can be appended to the BigQuery table
+    without relaxing REQUIRED columns or changing TIMESTAMP to DATETIME.
+    
+    Args:
+        schema: Table schema as (name, type, mode, description) tuples
+    
+    Returns:
+        Arrow schema with the same column order
+    """
+    return pa.schema([
+        pa.field(name, ARROW_TYPES[field_type], nullable=mode != 'REQUIRED')
+        for name, field_type, mode, _ in schema
+    ])
@@ -8,21 +8,37 @@ using the Faker library.
 from faker import Faker
 import pandas as pd
 import numpy as np
+import pyarrow as pa
 from datetime import datetime, timedelta
 from typing import List, Dict
-import uuid
+
+from .ids import random_ids
 
 
 class UserGenerator:
     """Generate synthetic user profile data"""
     
-    def __init__(self, seed: int = 42):
+    # Low-cardinality attributes, stored as categorical columns
+    AGE_GROUPS = ['18-24', '25-34', '35-44', '45-54', '55+']
+    DEVICE_TYPES = ['iOS', 'Android']
+    USER_SEGMENTS = ['high_engagement', 'medium_engagement', 'low_engagement']
+    
+    # Default number of Faker names and locations to sample users from
+    FAKER_POOL_SIZE = 10_000
+    
+    # Engagement multiplier per age group, aligned with AGE_GROUPS
+    AGE_MULTIPLIERS = np.array([1.2, 1.3, 1.0, 0.8, 0.6])
+    
+    def __init__(self, seed: int = 42, faker_pool_size: int = FAKER_POOL_SIZE):
         """
         Initialize the user generator
         
         Args:
             seed: Random seed for reproducibility
+            faker_pool_size: Maximum number of distinct names and locations
+                generated with Faker (see generate_users)
         """
+        self.faker_pool_size = faker_pool_size
         self.fake = Faker('ko_KR')  # Korean locale for realistic Korean names/locations
         Faker.seed(seed)
         np.random.seed(seed)
@@ -33,6 +49,12 @@ class UserGenerator:
         """
         Generate user profile data
         
+        Names and locations are not unique per user: Faker generates at most
+        faker_pool_size of each, and larger runs sample users from those pools
+        (a 1M-user run with the default 10,000 repeats each value about 100
+        times). A bigger pool gives more variety at the cost of more Faker
+        calls, which dominate generation time.
+        
         Args:
             num_users: Number of users to generate
             start_date: Start date for user registration (default: 90 days ago)
@@ -46,41 +68,48 @@ class UserGenerator:
         if end_date is None:
             end_date = datetime.now()
         
-        users = []
+        # Draw each column for all users at once
+        days_between = (end_date - start_date).days
         
-        for _ in range(num_users):
-            user_id = str(uuid.uuid4())
-            
-            # Generate join date within the specified range
-            days_between = (end_date - start_date).days
-            random_days = np.random.randint(0, days_between + 1)
-            join_date = start_date + timedelta(days=random_days)
-            
-            # 70% of users verify their neighborhood
-            verified_neighborhood = np.random.random() < 0.7
-            
-            # Generate location (Korean city/district)
-            location = self.fake.city()
-            
-            user = {
-                'user_id': user_id,
-                'name': self.fake.name(),
-                'location': location,
-                'join_date': join_date.date(),
-                'verified_neighborhood': verified_neighborhood,
-                'created_at': join_date,
-                # Additional metadata for analysis
-                'age_group': np.random.choice(['18-24', '25-34', '35-44', '45-54', '55+'], 
-                                             p=[0.15, 0.35, 0.25, 0.15, 0.10]),
-                'device_type': np.random.choice(['iOS', 'Android'], p=[0.45, 0.55])
-            }
-            
-            users.append(user)
+        # Draw the join days already sorted, so users come out in
+        # chronological order without sorting the finished frame
+        random_days = np.sort(np.random.randint(0, days_between + 1, size=num_users))
+        created_at = np.datetime64(start_date, 'us') + random_days.astype('timedelta64[D]')
+        
+        # Join dates stay datetime64 arithmetic end to end and are stored as an
+        # Arrow date32 column (a DATE in Parquet and BigQuery), so no Python
+        # date objects are built
+        join_dates = pd.arrays.ArrowExtensionArray(pa.array(created_at.astype('datetime64[D]'), type=pa.date32()))
+        
+        # 70% of users verify their neighborhood
+        verified = np.random.random(num_users) < 0.7
+        
+        # Sample category codes rather than strings; they become the
+        # categorical columns' codes directly
+        age_codes = np.random.choice(len(self.AGE_GROUPS), size=num_users,
+                                     p=[0.15, 0.35, 0.25, 0.15, 0.10]).astype(np.int8)
+        device_codes = np.random.choice(len(self.DEVICE_TYPES), size=num_users, p=[0.45, 0.55]).astype(np.int8)
         
-        df = pd.DataFrame(users)
+        # Generate names and locations (Korean city/district), sampling from
+        # Faker pools once there are more users than faker_pool_size
+        pool_size = min(num_users, self.faker_pool_size)
+        names = np.array([self.fake.name() for _ in range(pool_size)], dtype=object)
+        locations = np.array([self.fake.city() for _ in range(pool_size)], dtype=object)
+        if pool_size < num_users:
+            names = names[np.random.randint(0, pool_size, size=num_users)]
+            locations = locations[np.random.randint(0, pool_size, size=num_users)]
         
-        # Sort by join_date for realistic chronological data
-        df = df.sort_values('join_date').reset_index(drop=True)
+        df = pd.DataFrame({
+            'user_id': random_ids(num_users),
+            'name': names,
+            'location': locations,
+            'join_date': join_dates,
+            'verified_neighborhood': verified,
+            'created_at': created_at,
+            # Additional metadata for analysis
+            'age_group': pd.Categorical.from_codes(age_codes, categories=self.AGE_GROUPS),
+            'device_type': pd.Categorical.from_codes(device_codes, categories=self.DEVICE_TYPES)
+        })
         
         return df
     
@@ -94,35 +123,18 @@ class UserGenerator:
         Returns:
             DataFrame with added segment column
         """
-        # Define user segments based on engagement likelihood
-        segments = []
+        # Higher engagement if verified neighborhood, scaled by age group
+        base_engagement = np.where(df['verified_neighborhood'].to_numpy(), 0.5, 0.3)
+        age_codes = pd.Index(self.AGE_GROUPS).get_indexer(df['age_group'])
+        # Age groups outside AGE_GROUPS (code -1) keep a neutral multiplier
+        age_multiplier = np.where(age_codes >= 0, self.AGE_MULTIPLIERS[age_codes], 1.0)
+        engagement_score = base_engagement * age_multiplier
         
-        for _, row in df.iterrows():
-            # Higher engagement if verified neighborhood
-            base_engagement = 0.5 if row['verified_neighborhood'] else 0.3
-            
-            # Age groups have different engagement patterns
-            age_multiplier = {
-                '18-24': 1.2,
-                '25-34': 1.3,
-                '35-44': 1.0,
-                '45-54': 0.8,
-                '55+': 0.6
-            }
-            
-            engagement_score = base_engagement * age_multiplier.get(row['age_group'], 1.0)
-            
-            # Categorize into segments
-            if engagement_score > 0.7:
-                segment = 'high_engagement'
-            elif engagement_score > 0.4:
-                segment = 'medium_engagement'
-            else:
-                segment = 'low_engagement'
-            
-            segments.append(segment)
+        # Categorize into segments
+        segments = np.select([engagement_score > 0.7, engagement_score > 0.4],
+                             ['high_engagement', 'medium_engagement'], default='low_engagement')
         
-        df['user_segment'] = segments
+        df['user_segment'] = pd.Categorical(segments, categories=self.USER_SEGMENTS)
         
         return df
 
@@ -0,0 +1,10 @@
+"""
+Make the repository root and scripts/ importable, as the scripts themselves do
+"""
+
+import os
+import sys
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'scripts'))
@@ -0,0 +1,26 @@
+"""
+Tests for deterministic A/B group assignment
+"""
+
+from src.generator.events import EventGenerator
+from src.generator.ids import random_ids
+
+
+def test_assignment_is_stable_per_user_id():
+    user_ids = random_ids(500)
+    groups = EventGenerator(seed=1).assign_ab_groups(user_ids)
+    
+    # Independent of the generator seed, the call and the position of the user
+    assert list(EventGenerator(seed=2).assign_ab_groups(user_ids)) == list(groups)
+    assert list(EventGenerator(seed=1).assign_ab_groups(user_ids[::-1])) == list(groups[::-1])
+    assert [EventGenerator().assign_ab_group(user_id) for user_id in user_ids[:20]] == list(groups[:20])
+
+
+def test_assignment_splits_users_20_20_60():
+    groups = EventGenerator().assign_ab_groups(random_ids(20_000))
+    shares = {group: (groups == group).mean() for group in EventGenerator.AB_GROUPS}
+    
+    # Control and treatment split the 40% in the experiment about evenly
+    assert abs(shares['control'] - 0.2) < 0.02
+    assert abs(shares['treatment'] - 0.2) < 0.02
+    assert abs(shares['none'] - 0.6) < 0.02
@@ -0,0 +1,71 @@
+"""
+Tests for sharded and streamed event generation
+"""
+
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+from generate_data import to_bigquery_table, write_events_parquet
+from src.generator.events import EventGenerator
+from src.generator.schema import EVENTS_SCHEMA, to_arrow_schema
+from src.generator.users import UserGenerator
+
+
+# Random identifiers come from os.urandom, so they differ between runs
+ID_COLUMNS = ['event_id', 'session_id', 'item_id']
+
+# Small shards so a few hundred users span several of them
+SHARD_SIZE = 50
+
+
+@pytest.fixture(scope='module')
+def users_df():
+    user_gen = UserGenerator(seed=42)
+    return user_gen.generate_user_segments(user_gen.generate_users(num_users=200))
+
+
+def without_ids(events_df: pd.DataFrame) -> pd.DataFrame:
+    """Drop the random identifier columns, keeping whether item_id is set"""
+    return events_df.drop(columns=ID_COLUMNS).assign(has_item=events_df['item_id'].notna())
+
+
+def test_repeated_calls_generate_the_same_events(users_df):
+    event_gen = EventGenerator(seed=7)
+    first = event_gen.generate_events_for_users(users_df, shard_size=SHARD_SIZE)
+    second = event_gen.generate_events_for_users(users_df, shard_size=SHARD_SIZE)
+    pd.testing.assert_frame_equal(without_ids(first), without_ids(second))
+
+
+def test_parallel_matches_single_process(users_df):
+    single = EventGenerator(seed=7).generate_events_for_users(users_df, shard_size=SHARD_SIZE, n_jobs=1)
+    parallel = EventGenerator(seed=7).generate_events_for_users(users_df, shard_size=SHARD_SIZE, n_jobs=2)
+    pd.testing.assert_frame_equal(without_ids(single), without_ids(parallel))
+
+
+def test_streamed_parquet_matches_in_memory(users_df, tmp_path):
+    events_file = str(tmp_path / 'events.parquet')
+    event_counts, ab_counts = write_events_parquet(EventGenerator(seed=7), users_df, events_file,
+                                                   chunk_size=100, shard_size=SHARD_SIZE)
+    
+    events_df = EventGenerator(seed=7).generate_events_for_users(users_df, shard_size=SHARD_SIZE)
+    expected = to_bigquery_table(events_df, to_arrow_schema(EVENTS_SCHEMA)).to_pandas()
+    streamed = pq.read_table(events_file).to_pandas()
+    
+    pd.testing.assert_frame_equal(without_ids(streamed), without_ids(expected))
+    assert event_counts.to_dict() == events_df['event_type'].value_counts().reindex(
+        EventGenerator.EVENT_TYPES).to_dict()
+    assert ab_counts.to_dict() == events_df['ab_group'].value_counts().reindex(
+        EventGenerator.AB_GROUPS).to_dict()
+
+
+def test_stream_shards_follow_chunk_size(users_df, tmp_path):
+    events_file = str(tmp_path / 'events.parquet')
+    event_counts, _ = write_events_parquet(EventGenerator(seed=7), users_df, events_file,
+                                           chunk_size=300, events_per_user_range=(2, 10))
+    
+    # One shard of about chunk_size events per row group, instead of a single shard
+    metadata = pq.ParquetFile(events_file).metadata
+    assert metadata.num_rows == event_counts.sum()
+    assert metadata.num_row_groups > 1
+    assert max(metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)) < 600
@@ -0,0 +1,24 @@
+"""
+Tests for the bulk identifier generator
+"""
+
+import uuid
+
+from src.generator.ids import random_ids
+
+
+def test_random_ids_empty():
+    ids = random_ids(0)
+    assert ids.shape == (0,)
+    assert ids.dtype == object
+
+
+def test_random_ids_are_uuid4_strings():
+    ids = random_ids(1000)
+    assert ids.shape == (1000,)
+    assert len(set(ids)) == 1000
+    for value in ids:
+        parsed = uuid.UUID(value)
+        assert str(parsed) == value
+        assert parsed.version == 4
+        assert parsed.variant == uuid.RFC_4122
@@ -0,0 +1,34 @@
+"""
+Tests for writing generated data with the declared table schemas
+"""
+
+import pyarrow as pa
+
+from generate_data import to_bigquery_table
+from src.generator.events import EventGenerator
+from src.generator.schema import EVENTS_SCHEMA, USERS_SCHEMA, to_arrow_schema
+from src.generator.users import UserGenerator
+
+
+def test_to_arrow_schema_follows_modes_and_types():
+    schema = to_arrow_schema(EVENTS_SCHEMA)
+    
+    assert schema.names == [name for name, *_ in EVENTS_SCHEMA]
+    assert not schema.field('event_id').nullable
+    assert schema.field('item_id').nullable
+    assert schema.field('event_timestamp').type == pa.timestamp('us', tz='UTC')
+    assert schema.field('message_length').type == pa.int64()
+
+
+def test_generated_tables_match_declared_schemas():
+    user_gen = UserGenerator(seed=1)
+    users_df = user_gen.generate_user_segments(user_gen.generate_users(num_users=100))
+    events_df = EventGenerator(seed=1).generate_events_for_users(users_df)
+    
+    for df, table_schema in ((users_df, USERS_SCHEMA), (events_df, EVENTS_SCHEMA)):
+        schema = to_arrow_schema(table_schema)
+        table = to_bigquery_table(df, schema)
+        assert table.schema.equals(schema)
+        for name, _, mode, _ in table_schema:
+            if mode == 'REQUIRED':
+                assert table.column(name).null_count == 0
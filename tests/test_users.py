@@ -0,0 +1,57 @@
+"""
+Tests for the user profile generator
+"""
+
+from datetime import datetime
+
+import pandas as pd
+import pyarrow as pa
+
+from src.generator.users import UserGenerator
+
+
+def segment_by_row(verified: bool, age_group: str) -> str:
+    """The original per-row segmentation rule"""
+    age_multiplier = {'18-24': 1.2, '25-34': 1.3, '35-44': 1.0, '45-54': 0.8, '55+': 0.6}
+    engagement_score = (0.5 if verified else 0.3) * age_multiplier.get(age_group, 1.0)
+    if engagement_score > 0.7:
+        return 'high_engagement'
+    if engagement_score > 0.4:
+        return 'medium_engagement'
+    return 'low_engagement'
+
+
+def test_names_and_locations_sampled_from_faker_pools():
+    users_df = UserGenerator(seed=1, faker_pool_size=20).generate_users(num_users=200)
+    
+    assert len(users_df) == 200
+    assert users_df['name'].notna().all() and users_df['location'].notna().all()
+    assert users_df['name'].nunique() <= 20
+    assert users_df['location'].nunique() <= 20
+
+
+def test_segments_match_per_row_rule():
+    age_groups = UserGenerator.AGE_GROUPS + ['unknown']
+    df = pd.DataFrame({
+        'verified_neighborhood': [verified for verified in (True, False) for _ in age_groups],
+        'age_group': age_groups * 2,
+    })
+    
+    segments = UserGenerator(seed=1).generate_user_segments(df)['user_segment']
+    
+    assert list(segments) == [segment_by_row(verified, age_group)
+                              for verified, age_group in zip(df['verified_neighborhood'], df['age_group'])]
+
+
+def test_join_dates_are_arrow_dates_in_range():
+    start_date, end_date = datetime(2025, 1, 1, 9, 30), datetime(2025, 3, 1, 9, 30)
+    users_df = UserGenerator(seed=1).generate_users(num_users=500, start_date=start_date, end_date=end_date)
+    
+    assert users_df['join_date'].dtype == pd.ArrowDtype(pa.date32())
+    assert users_df['created_at'].dtype == 'datetime64[us]'
+    join_dates = pd.to_datetime(users_df['join_date'])
+    assert join_dates.min() >= pd.Timestamp(start_date.date())
+    assert join_dates.max() <= pd.Timestamp(end_date.date())
+    # Users come out in join order, and created_at falls on the join date
+    assert join_dates.is_monotonic_increasing
+    assert (users_df['created_at'].dt.normalize() == join_dates).all()